@@ -126,7 +126,14 @@ def _get_shards(gcs_bucket_name: str, gcs_prefix: str) -> List[documentai.Docume
     total_shards = len(shards)
 
     if total_shards > 1:
-        shards.sort(key=lambda x: int(x.shard_info.shard_index))
+        shard_indices = [int(shard.shard_info.shard_index) for shard in shards]
+        # Only sort when the shards arrive out of order; the check is a
+        # single pass while sorting repeats the proto field accesses.
+        if any(
+            previous > current
+            for previous, current in zip(shard_indices, shard_indices[1:])
+        ):
+            shards.sort(key=lambda x: int(x.shard_info.shard_index))
 
         for shard in shards:
             if int(shard.shard_info.shard_count) != total_shards:
@@ -616,15 +623,17 @@ class Document:
         )
 
     def search_pages(
-        self, target_string: Optional[str] = None, pattern: Optional[str] = None
+        self,
+        target_string: Optional[str] = None,
+        pattern: Optional[Union[str, re.Pattern]] = None,
     ) -> List[Page]:
         r"""Returns the list of Pages containing target_string or text matching pattern.
 
         Args:
             target_string (Optional[str]):
                 Optional. target str.
-            pattern (Optional[str]):
-                Optional. regex str.
+            pattern (Optional[Union[str, re.Pattern]]):
+                Optional. regex str or pre-compiled pattern.
 
         Returns:
             List[Page]:
@@ -636,11 +645,15 @@ class Document:
                 "Exactly one of target_string and pattern must be specified."
             )
 
+        # Compile once so the pattern is not re-compiled for every page.
+        if pattern and not isinstance(pattern, re.Pattern):
+            pattern = re.compile(pattern)
+
         found_pages = [
             page
             for page in self.pages
             if (target_string and target_string in page.text)
-            or (pattern and re.search(pattern, page.text))
+            or (pattern and pattern.search(page.text))
         ]
 
         return found_pages